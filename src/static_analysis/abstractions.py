@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from jpamb import jvm
 
 @dataclass
@@ -207,44 +208,77 @@ class AState[AV]:
         )
  
 
+# Sign bits: a Sign is the bitwise or of the signs it may take
+POS, NEG, ZERO = 1, 2, 4
+_SIGN_BITS = {"+": POS, "-": NEG, "0": ZERO}
+# bits -> the same set spelled as {"+", "-", "0"} strings
+_SIGN_VALUES = tuple(
+    frozenset(c for c, b in _SIGN_BITS.items() if bits & b) for bits in range(8)
+)
+
+
+@lru_cache(maxsize=4096)
+def _abstract_bits(values) -> int:
+    bits = 0
+    for v in values:
+        bits |= POS if v > 0 else NEG if v < 0 else ZERO
+    return bits
+
+
 @dataclass
 class Sign:
-    values: set[str]
+    # Sign(bits), or Sign(iterable of "+", "-", "0") as before
+    bits: int
+
+    def __post_init__(self):
+        if not isinstance(self.bits, int):
+            bits = 0
+            for c in self.bits:
+                bits |= _SIGN_BITS[c]
+            self.bits = bits
+
+    @property
+    def values(self) -> frozenset[str]:
+        return _SIGN_VALUES[self.bits]
+
+    def __repr__(self):
+        return f"Sign({set(self.values)})"
+
     @staticmethod
     def top():
-        return Sign(("+", "-", "0"))
+        return Sign(POS | NEG | ZERO)
     
     def bottom():
-        return Sign(set())
+        return Sign(0)
  
     def is_le(self, other) -> bool:
-        return self.values <= other.values
+        return self.bits & ~other.bits == 0
  
     def join(self, other) -> bool:
-        return Sign(self.values | other.values)
+        return Sign(self.bits | other.bits)
     
     def meet(self, other) -> bool:
-        return Sign(self.values & other.values)
+        return Sign(self.bits & other.bits)
  
     @staticmethod
     def abstract(values: set[int]):
         if  isinstance(values, int):
-            values = {values}
-        return Sign(
-            {"+" for v in values if v > 0}
-            | {"-" for v in values if v < 0}
-            | {"0" for v in values if v == 0}
-        )
+            return Sign(_abstract_bits((values,)))
+        if len(values) <= 8:
+            # small sets recur (constants, short traces); larger ones are
+            # classified directly rather than filling the cache
+            return Sign(_abstract_bits(frozenset(values)))
+        return Sign(_abstract_bits.__wrapped__(values))
  
     def __contains__(self, value: int) -> bool:
         if value > 0:
-            return "+" in self.values
+            return bool(self.bits & POS)
 
         if value < 0:
-            return "-" in self.values
+            return bool(self.bits & NEG)
 
         if value == 0:
-            return "0" in self.values
+            return bool(self.bits & ZERO)
         
     def sign_add(x, y): #lookup table for sign addition
         if x == "0": return {y}
@@ -283,6 +317,28 @@ class Sign:
         else:
             return {"-"}
         
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def op_table(op):
+        """
+        Results of `op` for every pair of Signs, computed once per
+        operator: entry (a.bits << 3) | b.bits holds the result bits.
+        """
+        pair = {
+            (_SIGN_BITS[x], _SIGN_BITS[y]): Sign(op(x, y)).bits
+            for x in _SIGN_BITS
+            for y in _SIGN_BITS
+        }
+        table = [0] * 64
+        for a in range(8):
+            for b in range(8):
+                bits = 0
+                for (x, y), z in pair.items():
+                    if a & x and b & y:
+                        bits |= z
+                table[a << 3 | b] = bits
+        return table
+
     @staticmethod
     def binary_op(a, b, op): #op is a function
         """
@@ -295,14 +351,7 @@ class Sign:
         Returns:
             A new Sign containing all possible resulting signs.
         """
-        
-        result = set()
-        for x in a.values:
-            for y in b.values:
-                for z in op(x, y):
-                    
-                    result.add(z)
-        return Sign(result)
+        return Sign(Sign.op_table(op)[a.bits << 3 | b.bits])
 
 @dataclass
 class Parity:
@@ -39,9 +39,9 @@ def main() -> None:
     )
 
     # Hook up your symbolic engine
-    frontend = JVMFrontend(bytecode=bc, entry_method=methodid)
     config = SEConfig()
-    solver = Solver()
+    solver = Solver(threads=config.solver_threads)
+    frontend = JVMFrontend(bytecode=bc, entry_method=methodid)
     strategy = DFSStrategy()
 
     print("DEBUG: use_solver =", config.use_solver)
@@ -15,4 +15,5 @@ class SEConfig:
     timeout_seconds: float = 10.0
     strategy: str = "dfs"  # "dfs" or "bfs" (used by executor/strategy.py)
     use_solver: bool = True
+    solver_threads: int = 1  # > 1 lets Z3 use that many threads per query
     debug: bool = False   
\ No newline at end of file
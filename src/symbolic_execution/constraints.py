@@ -2,27 +2,60 @@ from __future__ import annotations
 
 from typing import Iterable
 
-from .symexpr import SymBool, BinaryOp, SymExpr
+from .symexpr import SymBool, BinaryOp, TRUE, FALSE, mk_binop
+
+# Comparison -> its negation
+_FLIP = {
+    "==": "!=",
+    "!=": "==",
+    "<": ">=",
+    ">=": "<",
+    "<=": ">",
+    ">": "<=",
+}
 
 
 def and_all(conds: Iterable[SymBool]) -> SymBool:
     """
     Build a conjunction of all constraints.
-    For now this just builds a left-associated tree of BinaryOp("and", ...).
+    For now this just builds a left-associated tree of BinaryOp("and", ...),
+    dropping TRUE conjuncts and folding to FALSE if any conjunct is FALSE.
     """
-    conds = list(conds)
-    if not conds:
+    result = None
+    for c in conds:
+        if c is TRUE:
+            continue
+        if c is FALSE:
+            return FALSE
+        result = c if result is None else mk_binop("and", result, c)
+    if result is None:
         # Empty conjunction is "true".
-        return SymBool(expr=True, concrete=True)
-    result: SymExpr = conds[0]
-    for c in conds[1:]:
-        result = BinaryOp("and", result, c)
+        return TRUE
     return SymBool(expr=result)
 
 
 def negate(cond: SymBool) -> SymBool:
     """
     Negate a single boolean condition.
-    The solver backend decides actual semantics.
+
+    Comparisons are flipped (not(a < b) is a >= b) rather than wrapped, and
+    the result is cached on the node so both polarities are built once.
+    Anything else is wrapped as ("not", cond) for the solver backend.
     """
+    if isinstance(cond, BinaryOp):
+        if cond._neg is not None:
+            return cond._neg
+        flipped = _FLIP.get(cond.op)
+        if flipped is not None:
+            neg = mk_binop(flipped, cond.lhs, cond.rhs)
+            object.__setattr__(cond, "_neg", neg)
+            if isinstance(neg, BinaryOp) and neg._neg is None:
+                object.__setattr__(neg, "_neg", cond)
+            return neg
+    elif cond is TRUE:
+        return FALSE
+    elif cond is FALSE:
+        return TRUE
+    elif isinstance(cond, SymBool) and isinstance(cond.expr, tuple) and cond.expr[0] == "not":
+        return cond.expr[1]
     return SymBool(expr=("not", cond), concrete=None)
\ No newline at end of file
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class CowSlots:
+    """
+    Copy-on-write JVM local variable slots of a SymbolicState.
+
+    Slots are small dense indices, so they are kept in a list indexed by
+    slot (None = never written) rather than a dict; it grows on demand.
+    `copy()` is O(1): both sides keep pointing at the same list and are
+    marked shared. The first write on either side clones the list (a flat
+    pointer copy, no rehashing), so states that never touch their locals
+    after a fork never pay for them. Reads use the dict-like interface
+    the frontend needs.
+    """
+    __slots__ = ("_data", "_shared")
+
+    def __init__(self, data: Optional[Dict[int, Any]] = None):
+        self._data: List[Any] = []
+        self._shared = False
+        if data:
+            for k, v in data.items():
+                self[k] = v
+
+    def copy(self) -> "CowSlots":
+        self._shared = True
+        new = CowSlots.__new__(CowSlots)
+        new._data = self._data
+        new._shared = True
+        return new
+
+    # ------------------------------------------------------------
+    # Writes (clone first if shared)
+    # ------------------------------------------------------------
+    def __setitem__(self, key: int, value) -> None:
+        data = self._data
+        if self._shared:
+            data = self._data = data[:]
+            self._shared = False
+        if key >= len(data):
+            data.extend([None] * (key + 1 - len(data)))
+        data[key] = value
+
+    # ------------------------------------------------------------
+    # Reads (straight through)
+    # ------------------------------------------------------------
+    def get(self, key: int, default=None):
+        if 0 <= key < len(self._data):
+            v = self._data[key]
+            if v is not None:
+                return v
+        return default
+
+    def __getitem__(self, key: int):
+        v = self.get(key)
+        if v is None:
+            raise KeyError(key)
+        return v
+
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+
+    def items(self) -> Iterator[Tuple[int, Any]]:
+        return ((k, v) for k, v in enumerate(self._data) if v is not None)
+
+    def keys(self) -> Iterator[int]:
+        return (k for k, _ in self.items())
+
+    def values(self) -> Iterator[Any]:
+        return (v for v in self._data if v is not None)
+
+    def __iter__(self) -> Iterator[int]:
+        return self.keys()
+
+    def __len__(self) -> int:
+        return sum(1 for v in self._data if v is not None)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CowSlots):
+            return dict(self.items()) == dict(other.items())
+        return dict(self.items()) == other
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class CowList:
+    """
+    Copy-on-write list used for the operand stack of a SymbolicState.
+
+    Same scheme as CowSlots: `copy()` is O(1) and both sides share the
+    storage. On top of that the logical length is tracked separately, so
+    popping from a shared stack just lowers it: forked states can pop
+    their operands without cloning, and only a push above the shared
+    prefix clones (up to the logical length). Only the list operations
+    the JVM frontend needs are provided.
+    """
+    __slots__ = ("_data", "_len", "_shared")
+
+    def __init__(self, data: Optional[Iterable[Any]] = None):
+        self._data = [] if data is None else list(data)
+        self._len = len(self._data)
+        self._shared = False
+
+    def copy(self) -> "CowList":
+        self._shared = True
+        new = CowList.__new__(CowList)
+        new._data = self._data
+        new._len = self._len
+        new._shared = True
+        return new
+
+    def _own(self) -> None:
+        self._data = self._data[:self._len]
+        self._shared = False
+
+    # ------------------------------------------------------------
+    # Writes (clone first if shared; pops never need to)
+    # ------------------------------------------------------------
+    def append(self, value) -> None:
+        if self._shared:
+            self._own()
+        self._data.append(value)
+        self._len += 1
+
+    def __setitem__(self, key: int, value) -> None:
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("list assignment index out of range")
+        if self._shared:
+            self._own()
+        self._data[key] = value
+
+    def pop(self):
+        if not self._len:
+            raise IndexError("pop from empty list")
+        self._len -= 1
+        if self._shared:
+            return self._data[self._len]
+        return self._data.pop()
+
+    def __delitem__(self, key) -> None:
+        # `del stack[-n:]` drops the top n entries
+        if (
+            isinstance(key, slice) and key.stop is None and key.step is None
+            and key.start is not None and -self._len <= key.start < 0
+        ):
+            self._len += key.start
+            if not self._shared:
+                del self._data[self._len:]
+            return
+        if self._shared:
+            self._own()
+        del self._data[key]
+        self._len = len(self._data)
+
+    # ------------------------------------------------------------
+    # Reads (within the logical length)
+    # ------------------------------------------------------------
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._data[:self._len][key]
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("list index out of range")
+        return self._data[key]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return islice(self._data, self._len)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CowList):
+            return self._data[:self._len] == other._data[:other._len]
+        return self._data[:self._len] == other
+
+    def __repr__(self) -> str:
+        return repr(self._data[:self._len])
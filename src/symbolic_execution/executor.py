@@ -13,8 +13,12 @@ class SymbolicExecutor:
     """
     Main symbolic executor loop:
     - pulls states from the strategy’s worklist
-    - prunes unsat / over-depth states
+    - prunes unsat / over-depth states (the solver is incremental: its
+      assertion stack follows the order states come off the worklist,
+      so under DFS each check only pushes what the last branch added)
     - delegates JVM instruction semantics to JVMFrontend
+      (step() may return the very state it was given, so a state is
+      never reused after being expanded)
     - collects Findings when terminated with errors
     """
     def __init__(
@@ -19,7 +19,7 @@ class Finding:
             kind=state.error,
             pc=state.pc,
             path_constraint=state.path_constraint.copy(),
-            return_value=getattr(state, "return_value", None),
+            return_value=state.return_value,
         )
 
     def __repr__(self) -> str:
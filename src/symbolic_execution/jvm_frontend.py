@@ -1,551 +1,659 @@
 from __future__ import annotations
-from typing import Any, List
-from unittest import case
-from venv import logger
+import itertools
+from typing import List
 from jpamb import jvm
 from interpreter import PC, Bytecode  
-from .config import SEConfig
-from .symexpr import SymInt, BinaryOp, SymArrayRef, SymArrayElem
+from .symexpr import SymInt, SymArrayRef, TRUE, FALSE, ZERO, mk_int, mk_binop, mk_array_elem, nonneg, substitute
 from .symstate import SymbolicState 
 from .constraints import negate
 
+# Upper bound on remembered jump-target states; past it the memo starts
+# over, which only costs re-exploring some states
+_VISITED_MAX = 4096
+
+# If / Ifz condition -> comparison operator (Ifz compares against 0 / null)
+_COND_OPS = {
+    "eq": "==",
+    "ne": "!=",
+    "lt": "<",
+    "ge": ">=",
+    "gt": ">",
+    "le": "<=",
+    "is": "==",      # null
+    "isnot": "!=",   # non-null
+}
+
+# Exception classes whose construction ends the path with a known outcome
+_EXCEPTION_LABELS = {
+    "java/lang/AssertionError": "assertion error",
+    "java/lang/NullPointerException": "null pointer",
+    "java/lang/ArrayIndexOutOfBoundsException": "out of bounds",
+    "java/lang/ArithmeticException": "divide by zero",
+}
+
+
+def _is_symbol(e) -> bool:
+    return isinstance(e, SymInt) and e.name is not None and e.concrete is None
+
+
+def _is_const(e) -> bool:
+    return isinstance(e, SymInt) and e.concrete is not None
+
+
 class JVMFrontend:
-    def __init__(self, bytecode: Bytecode, entry_method: jvm.AbsMethodID):
+    def __init__(
+        self,
+        bytecode: Bytecode,
+        entry_method: jvm.AbsMethodID,
+    ):
         self.bytecode = bytecode
         self.entry_method = entry_method
 
+        # Compiled instructions per method (see _compile)
+        self._programs: dict[jvm.AbsMethodID, list] = {}
+
+        # States already expanded at a jump target during the current run
+        # (see _memo_key); reset by initial_state()
+        self._visited: set = set()
+
+        # Array summaries ({"length", "type"}) by array name. They never
+        # change after allocation, so they live here rather than being
+        # copied along with every state's locals.
+        self.array_table: dict[str, dict] = {}
+
+        # Fresh ids for arrays allocated by NewArray
+        self._arr_counter = itertools.count()
+
+        # Opcode class -> handler; Binary is further split on its operator.
+        # Resolved once per instruction by _compile.
+        self._dispatch = {
+            jvm.Push: self._op_push,
+            jvm.Return: self._op_return,
+            jvm.Get: self._op_get,
+            jvm.Boolean: self._op_boolean,
+            jvm.Ifz: self._op_ifz,
+            jvm.If: self._op_if,
+            jvm.New: self._op_new,
+            jvm.Dup: self._op_dup,
+            jvm.InvokeStatic: self._op_invoke_static,
+            jvm.NewArray: self._op_new_array,
+            jvm.ArrayLength: self._op_array_length,
+            jvm.ArrayStore: self._op_array_store,
+            jvm.ArrayLoad: self._op_array_load,
+            jvm.Cast: self._op_cast,
+            jvm.Goto: self._op_goto,
+            jvm.Store: self._op_store,
+            jvm.Load: self._op_load,
+            jvm.Throw: self._op_throw,
+        }
+        incr = getattr(jvm, "Incr", None)
+        if incr is not None:
+            self._dispatch[incr] = self._op_incr
+        # Binary operator -> (handler, SymExpr operator passed as operand)
+        self._binary = {
+            jvm.BinaryOpr.Add: (self._op_arith, "+"),
+            jvm.BinaryOpr.Sub: (self._op_arith, "-"),
+            jvm.BinaryOpr.Mul: (self._op_arith, "*"),
+            jvm.BinaryOpr.Div: (self._op_div_rem, "//"),
+            jvm.BinaryOpr.Rem: (self._op_div_rem, "%"),
+        }
+
+        # Handlers that always continue with `s` itself at the next offset;
+        # runs of them are executed in one step (see step)
+        self._straight = {
+            self._op_push, self._op_get, self._op_boolean,
+            self._op_arith,
+            self._op_dup, self._op_new_array, self._op_array_length,
+            self._op_cast, self._op_store, self._op_load, self._op_incr,
+        }
+
+        # Push: value type -> constant SymInt
+        # (booleans map to 0/1, just like the concrete interpreter)
+        self._push_handlers = {
+            jvm.Int: lambda v: mk_int(v.value),
+            jvm.Boolean: lambda v: mk_int(1 if v.value else 0),
+        }
+        char = getattr(jvm, "Char", None)
+        if char is not None:
+            self._push_handlers[char] = lambda v: mk_int(
+                ord(v.value) if isinstance(v.value, str) else v.value
+            )
+
     def initial_state(self, config) -> SymbolicState:
-        # Start at PC=0 in the entry method
+        # Start at PC=0 in the entry method, compiled up front
+        if self.entry_method not in self._programs:
+            self._programs[self.entry_method] = self._compile(self.entry_method)
         state = SymbolicState(pc=PC(self.entry_method, 0))
-        state.depth = 0
 
-        #   - 0-arg methods just ignore them
-        #   - 1-arg methods use locals[0]
-        #   - 2-arg methods (like divideZeroByZero) use locals[0], locals[1]
-        state.locals[0] = SymInt(name="arg0")
-        state.locals[1] = SymInt(name="arg1")
+        # A new run must not skip states it has not expanded itself
+        self._visited.clear()
+
+        # One symbolic input per parameter. Array parameters get a
+        # SymArrayRef named after the argument, whose summary (with a
+        # symbolic, non-negative length) is stored under that same name,
+        # so array opcodes resolve it with a plain lookup.
+        for i, t in enumerate(self.entry_method.methodid.params):
+            name = f"arg{i}"
+            if isinstance(t, jvm.Array):
+                length = SymInt(name=f"{name}_len")
+                self.array_table[name] = {"length": length, "type": t.contains}
+                state.locals[i] = SymArrayRef(name=name)
+                state.path_constraint = state.path_constraint.add(nonneg(length))
+            else:
+                state.locals[i] = SymInt(name=name)
 
         return state
 
-    # added to prevent returning none from step() 
-    def step(self, s: SymbolicState) -> list[SymbolicState]:
-        result = self._step_impl(s)
-        if result is None:
-            pc = PC(self.entry_method, s.pc)
-            opcode = self.bytecode[pc]
-            raise RuntimeError(
-                f"Frontend.step() returned None at pc={s.pc}, opcode={opcode!r}"
-            )
-        return result
-
-    def _step_impl(self, s: SymbolicState):
+    def _compile(self, method: jvm.AbsMethodID) -> list:
+        """
+        `method` compiled for stepping: per offset a tuple
+        (handler, operand, next pc, jump pc, is jump target, straight-line).
+        Built once per method (cached in self._programs), with handlers,
+        constants and successor PCs resolved, so executing an instruction
+        is a list index and a call.
+        """
+        self.bytecode[PC(method, 0)]   # decodes and caches the method
+        code = self.bytecode.methods[method]
+        pcs = [PC(method, i) for i in range(len(code) + 1)]
+        targets = {
+            op.target for op in code
+            if isinstance(op, (jvm.Goto, jvm.If, jvm.Ifz))
+        }
+
+        prog = []
+        for offset, opr in enumerate(code):
+            handler = self._dispatch.get(type(opr), self._op_unhandled)
+            arg = opr
+            jump = None
+            match opr:
+                case jvm.Binary():
+                    handler = self._op_unhandled
+                    if isinstance(opr.type, jvm.Int):
+                        handler, arg = self._binary.get(
+                            opr.operant, (handler, opr)
+                        )
+                case jvm.Push(value=v):
+                    h = self._push_handlers.get(type(v.type))
+                    if h is None:
+                        handler = self._op_push_unsupported
+                    else:
+                        arg = h(v)
+                case jvm.If() | jvm.Ifz():
+                    arg = (opr.condition, _COND_OPS.get(opr.condition))
+                    jump = pcs[opr.target]
+                case jvm.Goto():
+                    jump = pcs[opr.target]
+                case jvm.New(classname=c):
+                    name = c.slashed()
+                    arg = _EXCEPTION_LABELS.get(name, f"unsupported new: {name}")
+            prog.append((
+                handler, arg, pcs[offset + 1], jump,
+                offset in targets, handler in self._straight,
+            ))
+        return prog
+
+    def _memo_key(self, s: SymbolicState, method, offset: int):
+        """
+        Identity of `s` for memoized execution. The path constraint is
+        keyed by node identity (PathConstraint compares by identity, like
+        Solver._by_node), which is O(1); states that reach a target with
+        the same constraints along different nodes are simply not merged.
+        """
+        return (
+            method,
+            offset,
+            tuple(s.stack),
+            frozenset(s.locals.items()),
+            s.path_constraint,
+        )
+
+    def _concretize(self, s: SymbolicState, lhs, rhs) -> None:
+        """
+        Implied-value concretization: `s` has just assumed lhs == rhs. If one
+        side is an input symbol and the other a constant, replace the symbol
+        by the constant in the stack and locals so later expressions (and
+        solver queries) no longer mention it.
+        """
+        if _is_symbol(lhs) and _is_const(rhs):
+            name, value = lhs.name, rhs
+        elif _is_symbol(rhs) and _is_const(lhs):
+            name, value = rhs.name, lhs
+        else:
+            return
+
+        # Only entries that mention the symbol are written, so a fork whose
+        # stack and locals do not mention it keeps sharing them.
+        stack = s.stack
+        for i, v in enumerate(stack):
+            new_v = substitute(v, name, value)
+            if new_v is not v:
+                stack[i] = new_v
+        for k, v in list(s.locals.items()):
+            new_v = substitute(v, name, value)
+            if new_v is not v:
+                s.locals[k] = new_v
+
+    def _split(self, s: SymbolicState, cond):
+        """
+        Fork `s` on `cond` into (state assuming cond, state assuming not
+        cond). A side that `cond` already folded away is None and is never
+        built, neither copied nor negated; the other side reuses `s`.
+        """
+        if cond is TRUE:
+            return s, None
+        if cond is FALSE:
+            return None, s
+        taken = s.copy()
+        taken.path_constraint = taken.path_constraint.add(cond)
+        s.path_constraint = s.path_constraint.add(negate(cond))
+        return taken, s
+
+    def _emit(self, successors: List[SymbolicState]) -> List[SymbolicState]:
+        """
+        Drop successors of a branching opcode that are known to be
+        infeasible without asking the solver: never built (None), or their
+        new constraint folded to false. Everything else is left for the
+        executor's satisfiability check.
+        """
+        return [
+            succ for succ in successors
+            if succ is not None and succ.path_constraint.head is not FALSE
+        ]
+
+    def _bounds_split(self, s: SymbolicState, idx, length):
+        """
+        Split an array access on 0 <= idx < length. Returns the in-bounds
+        state (`s` itself, or None if the access is never in bounds) and
+        one terminated error state per bound that can be violated. A
+        bound that is already known to hold gets no error state, so an
+        access with a known-good index copies nothing.
+        """
+        # Bounds that folded to true, or that the path already assumes
+        # (an earlier access with the same index node: constraints are
+        # hash-consed), can't fail and are not added again.
+        path = s.path_constraint
+        bounds = [
+            c for c in (mk_binop(">=", idx, ZERO), mk_binop("<", idx, length))
+            if c is not TRUE and c not in path
+        ]
+        ok = None if FALSE in bounds else s
+
+        errors = []
+        for i, c in enumerate(bounds):
+            # with no in-bounds state, the last error state reuses `s`
+            last = i == len(bounds) - 1
+            err = s if ok is None and last else s.copy()
+            err.path_constraint = err.path_constraint.add(negate(c))
+            err.terminated = True
+            err.error = "out of bounds"
+            errors.append(err)
+
+        if ok is not None:
+            for c in bounds:
+                ok.path_constraint = ok.path_constraint.add(c)
+        return ok, errors
 
-        # 1. Normalize PC
-        if isinstance(s.pc, int):
-            method = self.entry_method
-            offset = s.pc
+    def step(self, s: SymbolicState) -> list[SymbolicState]:
+        """
+        Execute one instruction (or a run of straight-line instructions
+        ending at a branch, jump target or end of path) and return the
+        successor states.
+
+        Opcodes with a single successor mutate `s` in place and return it;
+        only branching opcodes copy. Callers must not reuse `s` afterwards.
+        Every handler returns a list, so this is a table lookup and a call.
+        """
+        pc = s.pc
+        prog = self._programs.get(pc.method)
+        if prog is None:
+            prog = self._programs[pc.method] = self._compile(pc.method)
+
+        # Memoization at jump targets: an identical state that was
+        # already expanded here has an identical subtree
+        if prog[pc.offset][4]:
+            key = self._memo_key(s, pc.method, pc.offset)
+            visited = self._visited
+            if key in visited:
+                return []
+            if len(visited) >= _VISITED_MAX:
+                visited.clear()
+            visited.add(key)
+
+        # Straight-line opcodes are chained in place up to the next branch,
+        # jump target or end of path, instead of making a round trip
+        # through the executor's worklist per instruction.
+        while True:
+            handler, arg, nxt, jump, _, straight = prog[s.pc.offset]
+            succ = handler(s, arg, nxt, jump)
+            if not straight or s.terminated or prog[s.pc.offset][4]:
+                return succ
+
+    # ------------------------------------------------------------
+    # Opcode handlers: (state, opcode, next pc, jump pc) -> successors
+    # ------------------------------------------------------------
+    def _op_arith(self, s: SymbolicState, opr, nxt, jump):
+        # Add / Sub / Mul; `opr` is the operator, resolved by _compile
+        rhs = s.stack.pop()
+        lhs = s.stack.pop()
+        s.stack.append(mk_binop(opr, lhs, rhs))
+        s.pc = nxt
+        return [s]
+
+    def _op_div_rem(self, s: SymbolicState, opr, nxt, jump):
+        # Div / Rem ("//" or "%"): branch on a zero divisor
+        rhs = s.stack.pop()  # divisor
+        lhs = s.stack.pop()  # dividend
+
+        err_state, ok_state = self._split(s, mk_binop("==", rhs, ZERO))
+
+        # Error branch: divide by zero
+        if err_state is not None:
+            err_state.terminated = True
+            err_state.error = "divide by zero"
+
+        # OK branch: symbolic quotient / remainder
+        if ok_state is not None:
+            ok_state.stack.append(mk_binop(opr, lhs, rhs))
+            ok_state.pc = nxt
+
+        return self._emit([err_state, ok_state])
+
+    def _op_push(self, s: SymbolicState, opr, nxt, jump):
+        # `opr` is the shared constant, built once by _compile
+        new = s
+        new.stack.append(opr)
+        new.pc = nxt
+        return [new]
+
+    def _op_push_unsupported(self, s: SymbolicState, opr, nxt, jump):
+        # For now, mark unsupported types as an error so we notice them
+        new = s
+        new.terminated = True
+        new.error = None
+        return [new]
+
+    def _op_return(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        if opr.type is None:
+            new.return_value = None
+        elif isinstance(opr.type, jvm.Int):
+            new.return_value = new.stack.pop()   # (optional but useful)
         else:
-            method = s.pc.method
-            offset = s.pc.offset
-
-        pc = PC(method, offset)
-
-        # 2. Look up opcode  <-- THIS WAS MISSING
-        opr = self.bytecode[pc]
-
-
-        match opr:
-            
-            case jvm.Binary(type=jvm.Int(), operant=jvm.BinaryOpr.Sub):
-                new = s.copy()
-                rhs = new.stack.pop()
-                lhs = new.stack.pop()
-                new.stack.append(BinaryOp("-", lhs, rhs))
-                new.pc = PC(method, offset + 1)
-                return [new]
-            
-            
-            case jvm.Push(value=v):
-                new = s.copy()     
-                match v.type:
-                    case jvm.Int():
-                        # push a concrete integer as a SymInt
-                        new.stack.append(SymInt(concrete=v.value))
-
-                    case jvm.Boolean():
-                        # map booleans to 0/1, just like your concrete code does elsewhere
-                        concrete = 1 if v.value else 0
-                        new.stack.append(SymInt(concrete=concrete))
-
-                    case _:
-                        # For now, mark unsupported types as an error so we notice them
-                        new.terminated = True
-                        new.error = None
-                        return [new]
-
-                new.pc += 1
-                return [new]
-            
-            case jvm.Return(type=jvm.Int()):
-                new = s.copy()
-                retval = new.stack.pop()
-                new.terminated = True
-                new.error = "ok"
-                new.return_value = retval   # (optional but useful)
-
-                return [new]
-            
-            case jvm.Return(type=None):
-                new = s.copy()
-                new.return_value = None
-                new.terminated = True
-                new.error = "ok"
-                return [new]
-
-            case jvm.Get(static=st, field=f):
-                new = s.copy()  # now 's' is still the SymbolicState
-
-                # Match concrete interpreter: static int fields → value 0
-                new.stack.append(SymInt(concrete=0))
-
-                new.pc = PC(method, offset + 1)
-                return [new]
-                
-            case jvm.Boolean():
-                new = s.copy()
-
-                # create a symbolic boolean (integer 0/1)
-                name = f"bool_{len(new.stack)}"
-                new.stack.append(SymInt(name=name))
-
-                new.pc = PC(method, offset + 1)
-                return [new]
-
-            case jvm.Ifz(condition=cond, target=target):
-                if not s.stack:
-                    new = s.copy()
-                    new.terminated = True
-                    new.error = "*"
-                    return [new]
-
-                value = s.stack[-1]
-
-                true_state = s.copy()
-                false_state = s.copy()
-
-                # Pop the value
-                true_state.stack = true_state.stack[:-1]
-                false_state.stack = false_state.stack[:-1]
-
-                # Comparison with 0 / null
-                zero = SymInt(0)  # or however you represent literal 0
-                op_map = {
-                    "eq": "==",
-                    "ne": "!=",
-                    "lt": "<",
-                    "ge": ">=",
-                    "gt": ">",
-                    "le": "<=",
-                    "is": "==",      # null
-                    "isnot": "!=",   # non-null
-                }
-
-                if cond not in op_map:
-                    new = s.copy()
-                    new.terminated = True
-                    new.error = "*"
-                    return [new]
-
-                op = op_map[cond]
-                cond_expr = BinaryOp(op, value, zero)
-
-                true_state.path_constraint.add(cond_expr)
-                false_state.path_constraint.add(negate(cond_expr))
-
-                # Import once at top of file:
-                # from jpamb.jvm.bytecode import PC
-
-                method = s.pc.method
-                true_state.pc = PC(method, target)
-                false_state.pc = PC(method, s.pc.offset + 1)
-
-                return [true_state, false_state]
-
-            case jvm.Binary(type=jvm.Int(), operant=jvm.BinaryOpr.Add):
-                new = s.copy()
-                # Pop RHS (top) and LHS (below top)
-                rhs = new.stack.pop()
-                lhs = new.stack.pop()
-
-                # Push symbolic sum
-                new.stack.append(BinaryOp("+", lhs, rhs))
-
-                new.pc = PC(method, offset + 1)
-                return [new]
-                    
-            
-            case jvm.If(condition=c, target=t):
-                # Extract PC fields
-                method = s.pc.method
-                offset = s.pc.offset
-
-                # Clone states
-                true_state = s.copy()
-                false_state = s.copy()
-
-                # Operands
-                rhs = s.stack[-1]
-                lhs = s.stack[-2]
-
-                # Translate JVM condition
-                if c == "ne":
-                    op = "!="
-                elif c == "eq":
-                    op = "=="
-                elif c == "gt":
-                    op = ">"
-                elif c == "ge":
-                    op = ">="
-                elif c == "lt":
-                    op = "<"
-                elif c == "le":
-                    op = "<="
-                else:
-                    raise NotImplementedError(f"Unknown If condition: {c}")
-
-                cond_expr = BinaryOp(op, lhs, rhs)
-
-                # Pop operands
-                true_state.stack = true_state.stack[:-2]
-                false_state.stack = false_state.stack[:-2]
-
-                # Add constraints
-                true_state.path_constraint.add(cond_expr)
-                false_state.path_constraint.add(negate(cond_expr))
-
-                # Jump vs fall-through
-                true_state.pc = PC(method, t)
-                false_state.pc = PC(method, offset + 1)
-
-                return [true_state, false_state]
-            
-            case jvm.Binary(type=jvm.Int(), operant=jvm.BinaryOpr.Rem):
-                # Integer remainder: lhs % rhs
-                err_state = s.copy()
-                ok_state = s.copy()
-
-                rhs = s.stack[-1]  # divisor
-                lhs = s.stack[-2]  # dividend
-                zero = SymInt(concrete=0)
-
-                # condition: rhs == 0  (mod by zero is also illegal)
-                cond_expr = BinaryOp("==", rhs, zero)
-
-                # Error branch: divide by zero
-                err_state.stack = err_state.stack[:-2]
-                err_state.path_constraint.add(cond_expr)
-                err_state.terminated = True
-                err_state.error = "divide by zero"
-
-                # OK branch: symbolic remainder
-                ok_state.stack = ok_state.stack[:-2]
-                ok_state.stack.append(BinaryOp("%", lhs, rhs))
-                ok_state.path_constraint.add(negate(cond_expr))
-                ok_state.pc = s.pc + 1
-
-                return [err_state, ok_state]
-                
-            case jvm.New(classname=c):
-                new = s.copy()
-                if c.slashed() == "java/lang/AssertionError":
-                    new.terminated = True
-                    new.error = "assertion error"
-                    return [new]
-
-                new.terminated = True
-                new.error = f"unsupported new: {c.slashed()}"
-                return [new]
-                
-            case jvm.Dup(words=w):
-                new = s.copy()
-
-                if not new.stack:
-                    new.terminated = True
-                    new.error = None
-                    return [new]
-
-                v = new.stack[-1]  # peek
-                new.stack.append(v)  # duplicate symbolic expr
-
-                new.pc = PC(method, offset + 1)
-                return [new]
-            
-            
-            case jvm.InvokeStatic(method=m):
-                new = s.copy()
-                new.terminated = True
-                new.error = None
-                return [new]
-                
-            case jvm.NewArray(type=t):
-                new = s.copy()
-
-                # Pop dimension (symbolic or concrete)
-                dim = new.stack.pop()
-
-                # symbolic arrays must have non-negative length
-                # optionally add constraint dim >= 0
-
-                # allocate a new heap array id
-                arr_id = f"arr_{id(new)}_{len(new.locals)}"
-
-                # store array summary in heap dict
-                new.locals[arr_id] = {
-                    "length": dim,   # SymInt
-                    "type": t,       # jvm.Int(), jvm.Float(), jvm.Reference()
-                }
-
-                # push a symbolic reference to this array
-                new.stack.append(
-                    SymArrayRef(name=arr_id)
-                )
-
-                new.pc = PC(method, offset + 1)
-                return [new]
-                
-            case jvm.ArrayLength():
-                new = s.copy()
-
-                # Pop symbolic array reference
-                arr_ref = new.stack.pop()
-
-                if not isinstance(arr_ref, SymArrayRef):
-                    new.terminated = True
-                    new.error = None
-                    return [new]
-
-                # Lookup array summary
-                if arr_ref.name not in new.locals:
-                    new.terminated = True
-                    new.error = "null pointer"
-                    return [new]
-
-                arr_info = new.locals[arr_ref.name]
-
-                # Extract symbolic length
-                length = arr_info["length"]
-
-                # Push symbolic length
-                new.stack.append(length)
-
-                # Advance PC
-                new.pc = PC(method, offset + 1)
-                return [new]
-
-            case jvm.ArrayStore(type=t):
-                # Make two copies for branching: OK path and OOB path
-                new_ok = s.copy()
-                new_err = s.copy()
-
-                # Pop value, index, array reference from OK branch
-                val = new_ok.stack.pop()
-                idx = new_ok.stack.pop()
-                arr_ref = new_ok.stack.pop()
-
-                # TYPE CHECK: array reference must be symbolic
-                if not isinstance(arr_ref, SymArrayRef):
-                    new_err.terminated = True
-                    new_err.error = None
-                    return [new_err]
-
-                # NULL CHECK: array summary must exist
-                if arr_ref.name not in new_ok.locals:
-                    new_err.terminated = True
-                    new_err.error = "null pointer"
-                    return [new_err]
-
-                arr_info = new_ok.locals[arr_ref.name]
-                length = arr_info["length"]     # symbolic length
-
-                # -------------------------------------
-                # Build in-bounds condition: 0 <= idx < length
-                # -------------------------------------
-                cond_ge_0 = BinaryOp(">=", idx, SymInt(concrete=0))
-                cond_lt_len = BinaryOp("<", idx, length)
-
-                # Add constraints to OK path
-                new_ok.path_constraint.add(cond_ge_0)
-                new_ok.path_constraint.add(cond_lt_len)
-                new_ok.pc = s.pc + 1
-
-                # Add negation to ERR path
-                # (not >= 0) OR (not < length)
-                new_err.path_constraint.add(negate(cond_ge_0))
-                new_err.path_constraint.add(negate(cond_lt_len))
-                new_err.terminated = True
-                new_err.error = "out of bounds"
-
-                return [new_ok, new_err]
-                
-            case jvm.ArrayLoad(type=t):
-                # OK path and ERR path
-                new_ok = s.copy()
-                new_err = s.copy()
-
-                # pop index and array reference
-                idx = new_ok.stack.pop()
-                arr_ref = new_ok.stack.pop()
-
-                # type check: array reference must be symbolic
-                if not isinstance(arr_ref, SymArrayRef):
-                    new_err.terminated = True
-                    new_err.error = f"ArrayLoad on non-array reference: {arr_ref}"
-                    return [new_err]
-
-                # null pointer?
-                if arr_ref.name not in new_ok.locals:
-                    new_err.terminated = True
-                    new_err.error = "null pointer"
-                    return [new_err]
-
-                arr_info = new_ok.locals[arr_ref.name]
-                length = arr_info["length"]    # symbolic length
-
-                # -------------------------
-                # Bounds checks
-                # -------------------------
-                cond_ge_0 = BinaryOp(">=", idx, SymInt(concrete=0))
-                cond_lt_len = BinaryOp("<", idx, length)
-                # OK path and ERR path
-                new_ok = s.copy()
-                new_err = s.copy()
-
-                # pop index and array reference
-                idx = new_ok.stack.pop()
-                arr_ref = new_ok.stack.pop()
-
-                # type check: array reference must be symbolic
-                if not isinstance(arr_ref, SymArrayRef):
-                    new_err.terminated = True
-                    new_err.error = f"ArrayLoad on non-array reference: {arr_ref}"
-                    return [new_err]
-
-                # null pointer?
-                if arr_ref.name not in new_ok.locals:
-                    new_err.terminated = True
-                    new_err.error = "null pointer"
-                    return [new_err]
-
-                arr_info = new_ok.locals[arr_ref.name]
-                length = arr_info["length"]    # symbolic length
-
-                # -------------------------
-                # Bounds checks
-                # -------------------------
-                cond_ge_0 = BinaryOp(">=", idx, SymInt(concrete=0))
-                cond_lt_len = BinaryOp("<", idx, length)
-
-                # True path: index in bounds
-                new_ok.path_constraint.add(cond_ge_0)
-                new_ok.path_constraint.add(cond_lt_len)
-
-                # Push symbolic element
-                new_ok.stack.append(
-                    SymArrayElem(arr_ref.name, idx)
-                )
-
-                new_ok.pc = s.pc + 1
-
-                # Error path: out of bounds
-                new_err.path_constraint.add(negate(cond_ge_0))
-                new_err.path_constraint.add(negate(cond_lt_len))
-                new_err.terminated = True
-                new_err.error = "out of bounds"
-
-                return [new_ok, new_err]
-                
-            case jvm.Cast(from_=f, to_=t):
-                new = s.copy()
-                new.pc = PC(method, offset + 1)
-                return [new]
-            
-            case jvm.Goto(target=t):
-                new = s.copy()
-                new.pc = t
-                return [new]
-                
-            case jvm.Store(type=t, index=i):
-                new = s.copy()
-                if not new.stack:
-                    new.terminated = True
-                    new.error = None
-                    return [new]
-                # Pop symbolic value
-                val = new.stack.pop()
-                # Write to locals
-                new.locals[i] = val
-                # Advance pc
-                new.pc = PC(method, offset + 1)
-                return [new]
-                
-            case jvm.Load(type=t, index=i):
-                new = s.copy()
-                if i not in new.locals:
-                    new.terminated = True
-                    new.error = None
-                    return [new]
-                val = new.locals[i]
-                # push symbolic value onto stack
-                new.stack.append(val)
-                new.pc = PC(method, offset + 1)
-                return [new]
-            
-            
-            case jvm.Binary(type=jvm.Int(), operant=jvm.BinaryOpr.Div):
-                # We symbolically branch on (rhs == 0)
-                err_state = s.copy()
-                ok_state = s.copy()
-
-                # Use original stack to read operands
-                rhs = s.stack[-1]  # divisor
-                lhs = s.stack[-2]  # dividend
-                zero = SymInt(concrete=0)
-
-                # condition: rhs == 0
-                cond_expr = BinaryOp("==", rhs, zero)
-
-                err_state.stack = err_state.stack[:-2]   # pop lhs, rhs
-                err_state.path_constraint.add(cond_expr)
-                err_state.terminated = True
-                err_state.error = "divide by zero"
-
-                ok_state.stack = ok_state.stack[:-2]    # pop lhs, rhs
-                ok_state.stack.append(BinaryOp("//", lhs, rhs))  # symbolic quotient
-                ok_state.path_constraint.add(negate(cond_expr))
-                ok_state.pc = s.pc + 1
-                return [err_state, ok_state]
-
-            case jvm.Binary(type=jvm.Int(), operant=jvm.BinaryOpr.Mul):
-                new = s.copy()
-
-                rhs = new.stack.pop()   # right operand
-                lhs = new.stack.pop()   # left operand
-
-                # Symbolic multiplication
-                new.stack.append(BinaryOp("*", lhs, rhs))
-                new.pc = PC(method, offset + 1)
-                return [new]
-                
-                
-            case jvm.Throw():
-                new = s.copy()
-                new.terminated = True
-                new.error = "assertion error"
-                return [new]
-            
-            case _:
-                print("UNHANDLED OPCODE:", opr, "at", s.pc)
-                new = s.copy()
-                new.terminated = True
-                new.error = "*"
-                return [new]
+            return self._op_unhandled(s, opr, nxt, jump)
+        new.terminated = True
+        new.error = "ok"
+        return [new]
+
+    def _op_get(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+
+        # Match concrete interpreter: static int fields → value 0
+        new.stack.append(ZERO)
+
+        new.pc = nxt
+        return [new]
+
+    def _op_boolean(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+
+        # create a symbolic boolean (integer 0/1)
+        name = f"bool_{len(new.stack)}"
+        new.stack.append(SymInt(name=name))
+
+        new.pc = nxt
+        return [new]
+
+    def _op_ifz(self, s: SymbolicState, opr, nxt, jump):
+        # `opr` is (condition, operator), resolved by _compile
+        _, op = opr
+        if not s.stack or op is None:
+            new = s
+            new.terminated = True
+            new.error = "*"
+            return [new]
+
+        # Pop the value
+        value = s.stack.pop()
+
+        # Array refs come from parameters or NewArray and are never null,
+        # so ifnull/ifnonnull on one is decided here, without the solver
+        if isinstance(value, SymArrayRef):
+            s.pc = jump if op == "!=" else nxt
+            return [s]
+
+        # Comparison with 0 / null
+        cond_expr = mk_binop(op, value, ZERO)
+        true_state, false_state = self._split(s, cond_expr)
+
+        if true_state is not None:
+            if op == "==":
+                self._concretize(true_state, value, ZERO)
+            true_state.pc = jump
+        if false_state is not None:
+            if op == "!=":
+                self._concretize(false_state, value, ZERO)
+            false_state.pc = nxt
+
+        return self._emit([true_state, false_state])
+
+    def _op_if(self, s: SymbolicState, opr, nxt, jump):
+        # `opr` is (condition, operator), resolved by _compile
+        c, op = opr
+        if op is None:
+            raise NotImplementedError(f"Unknown If condition: {c}")
+
+        # Pop operands
+        rhs = s.stack.pop()
+        lhs = s.stack.pop()
+
+        cond_expr = mk_binop(op, lhs, rhs)
+        true_state, false_state = self._split(s, cond_expr)
+
+        # Jump vs fall-through
+        if true_state is not None:
+            if op == "==":
+                self._concretize(true_state, lhs, rhs)
+            true_state.pc = jump
+        if false_state is not None:
+            if op == "!=":
+                self._concretize(false_state, lhs, rhs)
+            false_state.pc = nxt
+
+        return self._emit([true_state, false_state])
+
+    def _op_new(self, s: SymbolicState, opr, nxt, jump):
+        # `opr` is the outcome for the class, resolved by _compile
+        new = s
+        new.terminated = True
+        new.error = opr
+        return [new]
+
+    def _op_dup(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+
+        if not new.stack:
+            new.terminated = True
+            new.error = None
+            return [new]
+
+        v = new.stack[-1]  # peek
+        new.stack.append(v)  # duplicate symbolic expr
+
+        new.pc = nxt
+        return [new]
+
+    def _op_invoke_static(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        new.terminated = True
+        new.error = None
+        return [new]
+
+    def _op_new_array(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+
+        # Pop dimension (symbolic or concrete)
+        dim = new.stack.pop()
+
+        # symbolic arrays must have non-negative length
+        # optionally add constraint dim >= 0
+
+        # allocate a new heap array id
+        arr_id = f"arr_{next(self._arr_counter)}"
+
+        # store array summary in the frontend's table
+        self.array_table[arr_id] = {
+            "length": dim,       # SymInt
+            "type": opr.type,    # jvm.Int(), jvm.Float(), jvm.Reference()
+        }
+
+        # push a symbolic reference to this array
+        new.stack.append(
+            SymArrayRef(name=arr_id)
+        )
+
+        new.pc = nxt
+        return [new]
+
+    def _op_array_length(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+
+        # Pop symbolic array reference
+        arr_ref = new.stack.pop()
+
+        if not isinstance(arr_ref, SymArrayRef):
+            new.terminated = True
+            new.error = None
+            return [new]
+
+        # Lookup array summary
+        arr_info = self.array_table.get(arr_ref.name)
+        if arr_info is None:
+            new.terminated = True
+            new.error = "null pointer"
+            return [new]
+
+        # Extract symbolic length
+        length = arr_info["length"]
+
+        # Push symbolic length
+        new.stack.append(length)
+
+        # Advance PC
+        new.pc = nxt
+        return [new]
+
+    def _op_array_store(self, s: SymbolicState, opr, nxt, jump):
+        # Pop value, index, array reference
+        val = s.stack.pop()
+        idx = s.stack.pop()
+        arr_ref = s.stack.pop()
+
+        # TYPE CHECK: array reference must be symbolic
+        if not isinstance(arr_ref, SymArrayRef):
+            s.terminated = True
+            s.error = None
+            return [s]
+
+        # NULL CHECK: array summary must exist
+        arr_info = self.array_table.get(arr_ref.name)
+        if arr_info is None:
+            s.terminated = True
+            s.error = "null pointer"
+            return [s]
+
+        length = arr_info["length"]     # symbolic length
+
+        ok, errors = self._bounds_split(s, idx, length)
+        if ok is not None:
+            ok.pc = nxt
+        return self._emit([ok, *errors])
+
+    def _op_array_load(self, s: SymbolicState, opr, nxt, jump):
+        # pop index and array reference
+        idx = s.stack.pop()
+        arr_ref = s.stack.pop()
+
+        # type check: array reference must be symbolic
+        if not isinstance(arr_ref, SymArrayRef):
+            s.terminated = True
+            s.error = f"ArrayLoad on non-array reference: {arr_ref}"
+            return [s]
+
+        # null pointer?
+        arr_info = self.array_table.get(arr_ref.name)
+        if arr_info is None:
+            s.terminated = True
+            s.error = "null pointer"
+            return [s]
+
+        length = arr_info["length"]    # symbolic length
+
+        ok, errors = self._bounds_split(s, idx, length)
+        if ok is not None:
+            # Push symbolic element
+            ok.stack.append(mk_array_elem(arr_ref.name, idx))
+            ok.pc = nxt
+        return self._emit([ok, *errors])
+
+    def _op_cast(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        new.pc = nxt
+        return [new]
+
+    def _op_goto(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        new.pc = jump
+        return [new]
+
+    def _op_store(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        if not new.stack:
+            new.terminated = True
+            new.error = None
+            return [new]
+        # Pop symbolic value
+        val = new.stack.pop()
+        # Write to locals
+        new.locals[opr.index] = val
+        # Advance pc
+        new.pc = nxt
+        return [new]
+
+    def _op_load(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        i = opr.index
+        val = new.locals.get(i)
+        if val is None:
+            new.terminated = True
+            new.error = None
+            return [new]
+        # push symbolic value onto stack
+        new.stack.append(val)
+        new.pc = nxt
+        return [new]
+
+    def _op_incr(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        i = opr.index
+        val = new.locals.get(i)
+        if val is None:
+            new.terminated = True
+            new.error = None
+            return [new]
+        # local += amount, in place
+        new.locals[i] = mk_binop("+", val, mk_int(opr.amount))
+        new.pc = nxt
+        return [new]
+
+    def _op_throw(self, s: SymbolicState, opr, nxt, jump):
+        new = s
+        new.terminated = True
+        new.error = "assertion error"
+        return [new]
+
+    def _op_unhandled(self, s: SymbolicState, opr, nxt, jump):
+        print("UNHANDLED OPCODE:", opr, "at", s.pc)
+        new = s
+        new.terminated = True
+        new.error = "*"
+        return [new]
@@ -1,29 +1,84 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Iterable, List
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Iterator, List, Optional
 
 from .symexpr import SymBool
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True, eq=False, weakref_slot=True)   # see Solver._by_node
 class PathConstraint:
     """
     A sequence of boolean constraints that must all hold on this path.
     E.g. [x > 0, x < 10, y == x + 1].
 
+    Path constraints only ever grow, so they are stored as an immutable
+    linked list of additions: `add` returns a new node pointing at the old
+    one, and states forked at a branch share the whole common prefix.
+    The set of constraints (`key()`) is only built when something needs
+    it (membership tests, the solver's cache key), and is not stored on
+    the node, so adding a constraint hashes and copies nothing.
+
     Later, the solver translates this into an SMT formula.
     """
-    constraints: List[SymBool] = field(default_factory=list)
+    head: Optional[SymBool] = None
+    parent: Optional["PathConstraint"] = None
+    length: int = 0
 
-    def add(self, cond: SymBool) -> None:
-        self.constraints.append(cond)
+    def add(self, cond: SymBool) -> "PathConstraint":
+        # No membership test here: that would hash `cond` on every fork.
+        # Repeats are only caught by identity with the last constraint;
+        # the rest collapse in key().
+        if cond is self.head:
+            return self
+        return PathConstraint(cond, self, self.length + 1)
 
-    def extend(self, conds: Iterable[SymBool]) -> None:
-        self.constraints.extend(conds)
+    def extend(self, conds: Iterable[SymBool]) -> "PathConstraint":
+        pc = self
+        for c in conds:
+            pc = pc.add(c)
+        return pc
 
     def copy(self) -> "PathConstraint":
-        return PathConstraint(list(self.constraints))
-    
+        # Immutable, so sharing is safe.
+        return self
+
+    @property
+    def constraints(self) -> List[SymBool]:
+        return list(self)
+
+    def key(self) -> FrozenSet[SymBool]:
+        # Built on demand and not stored on the node: a cached set per
+        # node would hold n sets of size 1..n along a path of length n.
+        # Callers that need it repeatedly (the solver's cache) keep it.
+        heads = []
+        node = self
+        while node.parent is not None:
+            heads.append(node.head)
+            node = node.parent
+        return frozenset(heads)
+
+    def __contains__(self, cond: SymBool) -> bool:
+        # Walks the chain instead of building key(): no set is allocated,
+        # and hash-consed constraints mostly match on identity.
+        node = self
+        while node.parent is not None:
+            head = node.head
+            if head is cond or head == cond:
+                return True
+            node = node.parent
+        return False
+
+    def __iter__(self) -> Iterator[SymBool]:
+        out = []
+        node = self
+        while node.parent is not None:
+            out.append(node.head)
+            node = node.parent
+        return reversed(out)
+
+    def __repr__(self) -> str:
+        return f"PathConstraint({self.constraints!r})"
+
     def depth(self):
-        return len(self.constraints)
\ No newline at end of file
+        return self.length
@@ -1,46 +1,223 @@
 from __future__ import annotations
-from typing import Dict, Any
+import operator
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from z3 import (
     Solver as Z3Solver,
-    IntVal, Int, BoolVal, Bool,
-    Not
+    IntVal, Int, BoolVal, Bool, Array, IntSort, Select,
+    And, Not, is_int_value
 )
 
 from .path import PathConstraint
-from .symexpr import SymExpr, SymInt, SymBool, BinaryOp
+from .symexpr import SymExpr, SymInt, SymBool, BinaryOp, SymArrayElem
+
+
+def _children(expr) -> Tuple[Any, ...]:
+    """Operands of `expr` that _translate looks up (see Solver._postorder)."""
+    if isinstance(expr, BinaryOp):
+        return (expr.lhs, expr.rhs)
+    if isinstance(expr, SymBool):
+        inner = expr.expr
+        return (inner,) if isinstance(inner, (SymExpr, tuple)) else ()
+    if isinstance(expr, SymArrayElem):
+        return (expr.index,)
+    if isinstance(expr, tuple):     # ("not", cond)
+        return (expr[1],)
+    return ()
+
+
+# Bounds on the counterexample cache and on the solved sets it scans
+_CACHE_MAX = 4096
+_SOLVED_MAX = 512
+
+# Hash-consed node types, cached in Solver._terms
+_INTERNED = (BinaryOp, SymArrayElem)
 
 
 class Solver:
-    def __init__(self):
-        pass
+    # SymExpr operator -> Z3 term builder
+    _OPS: Dict[str, Callable[[Any, Any], Any]] = {
+        # boolean relations
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<":  operator.lt,
+        "<=": operator.le,
+        ">":  operator.gt,
+        ">=": operator.ge,
+        "and": And,
+        # arithmetic
+        "+":  operator.add,
+        "-":  operator.sub,
+        "*":  operator.mul,
+        "//": operator.truediv,     # `/` on Z3 Ints is integer division
+        "%":  operator.mod,
+    }
+
+    def __init__(self, threads: int = 1):
+        # Counterexample cache (as in KLEE): constraint set -> model, or
+        # None if unsat. Sibling paths share most of their constraints,
+        # so most queries are answered here without calling Z3. LRU,
+        # at most _CACHE_MAX sets.
+        self._cache: OrderedDict[FrozenSet, Optional[Dict[str, Any]]] = OrderedDict()
+
+        # The most recent entries Z3 actually answered, newest last.
+        # Subset/superset lookups only scan these: an answer derived from
+        # one of them adds nothing a later scan could not find through
+        # the original.
+        self._solved: deque = deque(maxlen=_SOLVED_MAX)
+
+        # The same answers per PathConstraint node, held weakly. Nodes hash
+        # by identity, so a state asked about again with an unchanged path
+        # (every step that adds no constraint) skips building its set.
+        self._by_node: WeakKeyDictionary = WeakKeyDictionary()
+
+        # Incremental Z3 instance: one push() scope per asserted path
+        # node, root first, so the node at position i has length i + 1.
+        # A query only pops back to the common prefix with the previous
+        # query and pushes the rest (see _sync).
+        self._z3 = Z3Solver()
+        # Z3 worker threads, set on this solver instance only.
+        # Path queries are small and answered incrementally on one
+        # assertion stack, so this only pays off for programs whose
+        # individual queries are hard; off by default.
+        if threads > 1:
+            self._z3.set("threads", threads)
+        self._asserted: List[PathConstraint] = []
+
+        # Z3 term per translated operator / array-element node, held
+        # weakly: an entry goes away with the last expression using it,
+        # so the solver does not pin everything it ever translated (and
+        # keeps mk_binop's weak hash-consing effective). Leaves and
+        # other wrappers are cheap and are translated again on use.
+        self._terms: WeakKeyDictionary = WeakKeyDictionary()
 
     # ------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------
     def is_sat(self, path: PathConstraint) -> bool:
-        z3 = Z3Solver()
-        for c in path.constraints:
-            z3.add(self._to_z3(c))
-        return z3.check().r == 1   # 1 = sat
+        return self._solve(path) is not None
 
     def get_model(self, path: PathConstraint) -> Dict[str, Any]:
-        z3 = Z3Solver()
-        for c in path.constraints:
-            z3.add(self._to_z3(c))
-        if z3.check().r != 1:
-            return {}
-        model = z3.model()
-
-        out = {}
-        for name, val in model:
-            out[str(name)] = model[val].as_long()
-        return out
+        model = self._solve(path)
+        return {} if model is None else model
+
+    # ------------------------------------------------------------
+    # Cached solving
+    # ------------------------------------------------------------
+    def _lookup(self, key: FrozenSet):
+        """(found, model) for `key` from the cache alone."""
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            return True, cache[key]
+
+        # A superset of an unsat set is unsat; a subset of a sat set is
+        # sat, with the same model. Newest first: the likeliest match is
+        # the query for a sibling path just explored.
+        for known, model in reversed(self._solved):
+            if model is None and known <= key:
+                self._remember(key, None)
+                return True, None
+            if model is not None and key <= known:
+                self._remember(key, model)
+                return True, model
+        return False, None
+
+    def _remember(self, key: FrozenSet, model) -> None:
+        cache = self._cache
+        cache[key] = model
+        if len(cache) > _CACHE_MAX:
+            cache.popitem(last=False)
+
+    def _solve(self, path: PathConstraint) -> Optional[Dict[str, Any]]:
+        if path in self._by_node:
+            return self._by_node[path]
+
+        key = path.key()
+        found, model = self._lookup(key)
+        if found:
+            self._by_node[path] = model
+            return model
+
+        z3 = self._sync(path)
+        if z3.check().r != 1:   # 1 = sat
+            model = None
+        else:
+            m = z3.model()
+            model = {}
+            for d in m.decls():
+                val = m[d]
+                model[d.name()] = val.as_long() if is_int_value(val) else val
+        self._remember(key, model)
+        self._solved.append((key, model))
+        self._by_node[path] = model
+        return model
+
+    def _sync(self, path: PathConstraint) -> Z3Solver:
+        """
+        Make the Z3 assertion stack hold exactly the constraints of `path`.
+        """
+        asserted = self._asserted
+
+        # Walk up to the deepest node that is already asserted
+        fresh = []
+        node = path
+        while node.length and (
+            node.length > len(asserted) or asserted[node.length - 1] is not node
+        ):
+            fresh.append(node)
+            node = node.parent
+
+        extra = len(asserted) - node.length
+        if extra:
+            self._z3.pop(extra)
+            del asserted[node.length:]
+
+        for n in reversed(fresh):
+            self._z3.push()
+            self._z3.add(self._to_z3(n.head))
+            asserted.append(n)
+        return self._z3
 
     # ------------------------------------------------------------
     # Expression translation
     # ------------------------------------------------------------
     def _to_z3(self, expr: SymExpr):
+        if type(expr) in _INTERNED:
+            term = self._terms.get(expr)
+            if term is not None:
+                return term
+        # Translate the new nodes below `expr` in one linear pass over
+        # their post-order, so each node finds its operands' terms already
+        # cached, whatever the depth of the tree. The root comes last.
+        terms = self._terms
+        for node in self._postorder(expr):
+            term = self._translate(node)
+            if type(node) in _INTERNED:
+                terms[node] = term
+        return term
+
+    def _postorder(self, root: SymExpr) -> List[Any]:
+        """Untranslated nodes of `root`, operands before their users."""
+        terms = self._terms
+        order = []
+        seen = set()
+        todo = [(root, False)]
+        while todo:
+            node, expanded = todo.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if id(node) in seen or (type(node) in _INTERNED and node in terms):
+                continue
+            seen.add(id(node))
+            todo.append((node, True))
+            todo.extend((child, False) for child in _children(node))
+        return order
+
+    def _translate(self, expr: SymExpr):
         match expr:
             case SymInt():
                 return self._z3_int(expr)
@@ -48,6 +225,10 @@ class Solver:
                 return self._z3_bool(expr)
             case BinaryOp(op, lhs, rhs):
                 return self._z3_binop(op, lhs, rhs)
+            case SymArrayElem(array, index):
+                # One uninterpreted Int -> Int array per array name, so
+                # equal indices read the same element.
+                return Select(Array(array, IntSort(), IntSort()), self._to_z3(index))
             case ("not", inner):
                 return Not(self._to_z3(inner))
 
@@ -64,11 +245,11 @@ class Solver:
     # Concrete or symbolic boolean
     def _z3_bool(self, v: SymBool):
         # If it’s a concrete Python bool, just wrap it
-        if getattr(v, "concrete", None) is not None:
+        if v.concrete is not None:
             return BoolVal(bool(v.concrete))
 
         # If it’s defined by some underlying expression, translate that
-        expr = getattr(v, "expr", None)
+        expr = v.expr
         if expr is not None:
             return self._to_z3(expr)
 
@@ -77,22 +258,7 @@ class Solver:
 
     # Arithmetic + comparison operators
     def _z3_binop(self, op, lhs, rhs):
-        zl = self._to_z3(lhs)
-        zr = self._to_z3(rhs)
-
-        # boolean relations
-        if op == "==": return zl == zr
-        if op == "!=": return zl != zr
-        if op == "<":  return zl <  zr
-        if op == "<=": return zl <= zr
-        if op == ">":  return zl >  zr
-        if op == ">=": return zl >= zr
-
-        # arithmetic
-        if op == "+":  return zl + zr
-        if op == "-":  return zl - zr
-        if op == "*":  return zl * zr
-        if op == "//": return zl / zr         # integer division
-        if op == "%":  return zl % zr
-
-        raise NotImplementedError(f"Unknown binary op: {op}")
\ No newline at end of file
+        fn = self._OPS.get(op)
+        if fn is None:
+            raise NotImplementedError(f"Unknown binary op: {op}")
+        return fn(self._to_z3(lhs), self._to_z3(rhs))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import List
 
 from .symstate import SymbolicState
@@ -59,10 +60,10 @@ class BFSStrategy(WorklistStrategy):
     """
 
     def init(self, initial: SymbolicState):
-        return [initial]  # queue
+        return deque([initial])  # queue
 
     def next(self, worklist):
-        return worklist.pop(0)  # FIFO
+        return worklist.popleft()  # FIFO, O(1) unlike list.pop(0)
 
     def add(self, worklist, state: SymbolicState):
         worklist.append(state)
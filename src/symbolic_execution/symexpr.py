@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import operator
 from abc import ABC
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Optional
+from weakref import WeakValueDictionary
 
 
 class SymExpr(ABC):
@@ -11,17 +14,20 @@ class SymExpr(ABC):
 
     At this stage it's just a tag type.
     The solver backend will later pattern-match on concrete subclasses.
+
+    Empty __slots__, so the slotted subclasses really have no per-instance
+    __dict__.
     """
-    pass
+    __slots__ = ()
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class SymArrayRef(SymExpr):
     name: str
 
     def __str__(self):
         return f"ArrayRef({self.name})"
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)   # see mk_array_elem
 class SymArrayElem(SymExpr):
     array: str
     index: SymExpr
@@ -29,7 +35,23 @@ class SymArrayElem(SymExpr):
     def __str__(self):
         return f"{self.array}[{self.index}]"
 
-@dataclass(slots=True)
+_ELEM_CACHE: WeakValueDictionary = WeakValueDictionary()
+
+
+def mk_array_elem(array: str, index: SymExpr) -> SymArrayElem:
+    """
+    The element `array[index]`, shared per (array, index node), so loading
+    the same cell again (e.g. in a loop) yields the same expression and
+    the solver sees one term for it.
+    """
+    key = (array, id(index))
+    elem = _ELEM_CACHE.get(key)
+    if elem is None:
+        elem = _ELEM_CACHE[key] = SymArrayElem(array, index)
+    return elem
+
+
+@dataclass(frozen=True, slots=True)
 class SymInt(SymExpr):
     """
     A symbolic or concrete integer.
@@ -49,7 +71,27 @@ class SymInt(SymExpr):
         return f"SymInt(concrete={self.concrete})"
 
 
-@dataclass(slots=True)
+# Concrete constants are immutable, so small ones are shared instead of
+# allocated at every push / zero-check in the frontend.
+_INT_CACHE: dict[int, SymInt] = {c: SymInt(concrete=c) for c in range(-128, 257)}
+ZERO = _INT_CACHE[0]
+
+
+@lru_cache(maxsize=4096)
+def _large_int(c: int) -> SymInt:
+    return SymInt(concrete=c)
+
+
+def mk_int(c: int) -> SymInt:
+    """
+    Return a concrete SymInt, interned for small values and memoized
+    (bounded) for the rest, e.g. folded loop counters.
+    """
+    v = _INT_CACHE.get(c)
+    return v if v is not None else _large_int(c)
+
+
+@dataclass(frozen=True, slots=True)
 class SymBool(SymExpr):
     """
     A symbolic or concrete boolean.
@@ -67,7 +109,7 @@ class SymBool(SymExpr):
         return self.concrete
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)   # see _BINOP_CACHE
 class BinaryOp(SymExpr):
     """
     Generic binary operator: lhs <op> rhs.
@@ -78,6 +120,162 @@ class BinaryOp(SymExpr):
     op: str
     lhs: SymExpr
     rhs: SymExpr
+    # negate() result, filled in on first use (see constraints.negate)
+    _neg: Optional[SymExpr] = field(default=None, compare=False, repr=False)
+    # hash((op, lhs, rhs)), set by _binop from the operands' own cached
+    # hashes, so hashing a node (path-constraint sets, memo keys) is O(1)
+    # instead of a walk over the whole tree
+    _hash: int = field(default=0, compare=False, repr=False)
+
+    def __hash__(self) -> int:
+        h = self._hash
+        if not h:
+            h = hash((self.op, self.lhs, self.rhs))
+            object.__setattr__(self, "_hash", h)
+        return h
 
     def __repr__(self) -> str:
-        return f"({self.lhs!r} {self.op} {self.rhs!r})"
\ No newline at end of file
+        return f"({self.lhs!r} {self.op} {self.rhs!r})"
+
+
+TRUE = SymBool(expr=True, concrete=True)
+FALSE = SymBool(expr=False, concrete=False)
+
+_ARITH = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "//": operator.floordiv,
+    "%": operator.mod,
+}
+
+# Operators that fold for any concrete operands.
+_EXACT = frozenset(("+", "-", "*"))
+
+_CMP = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+# Hash-consing: nodes built through mk_binop are shared, so the same
+# `idx < len` built on many paths is one object. Keyed on operand
+# identity, which is sound since a live node keeps its operands alive.
+_BINOP_CACHE: WeakValueDictionary = WeakValueDictionary()
+
+
+def _binop(op: str, lhs: SymExpr, rhs: SymExpr) -> BinaryOp:
+    key = (op, id(lhs), id(rhs))
+    node = _BINOP_CACHE.get(key)
+    if node is None:
+        node = _BINOP_CACHE[key] = BinaryOp(
+            op, lhs, rhs, _hash=hash((op, lhs, rhs))
+        )
+    return node
+
+
+def mk_binop(op: str, lhs: SymExpr, rhs: SymExpr) -> SymExpr:
+    """
+    Build `lhs <op> rhs`, folding it when the result is already known:
+    both sides concrete, or an identity such as x + 0, x * 1, x * 0, x - x.
+    Comparisons fold to TRUE / FALSE.
+    """
+    # Runs for every arithmetic op and branch, so the checks are inlined.
+    a = lhs.concrete if type(lhs) is SymInt else None
+    b = rhs.concrete if type(rhs) is SymInt else None
+
+    cmp = _CMP.get(op)
+    if cmp is not None:
+        if a is not None and b is not None:
+            return TRUE if cmp(a, b) else FALSE
+        if lhs is rhs:
+            return TRUE if op in ("==", "<=", ">=") else FALSE
+        return _binop(op, lhs, rhs)
+
+    if a is not None and b is not None:
+        # Division is only folded where Python, Z3 and the JVM agree.
+        if op in _EXACT or (a >= 0 and b > 0):
+            return mk_int(_ARITH[op](a, b))
+        return _binop(op, lhs, rhs)
+
+    if op == "+":
+        if a == 0:
+            return rhs
+        if b == 0:
+            return lhs
+    elif op == "-":
+        if b == 0:
+            return lhs
+        if lhs is rhs:
+            return ZERO
+    elif op == "*":
+        if a == 0 or b == 0:
+            return ZERO
+        if a == 1:
+            return rhs
+        if b == 1:
+            return lhs
+    elif op == "//":
+        if b == 1:
+            return lhs
+    elif op == "%":
+        if b == 1:
+            return ZERO
+    return _binop(op, lhs, rhs)
+
+
+def nonneg(e: SymExpr) -> SymExpr:
+    """
+    The constraint `e >= 0` (e.g. for an array length). Built through
+    mk_binop, so every path assuming it shares the same hash-consed node,
+    held only weakly by _BINOP_CACHE.
+    """
+    return mk_binop(">=", e, ZERO)
+
+
+def substitute(expr: SymExpr, name: str, value: SymExpr) -> SymExpr:
+    """
+    Replace the symbolic input `name` by `value` inside `expr`.
+    Subtrees that do not mention `name` are returned unchanged (same object).
+
+    Iterative post-order over the expression DAG (explicit stack, each
+    shared node visited once), so deep trees built by long loops neither
+    recurse nor get re-walked per use.
+    """
+    done: dict[int, SymExpr] = {}
+    todo = [(expr, False)]
+    while todo:
+        node, expanded = todo.pop()
+        key = id(node)
+        if not expanded and key in done:
+            continue
+        t = type(node)
+        if t is BinaryOp:
+            lhs, rhs = node.lhs, node.rhs
+            if not expanded:
+                todo.append((node, True))
+                todo.append((rhs, False))
+                todo.append((lhs, False))
+                continue
+            new_lhs, new_rhs = done[id(lhs)], done[id(rhs)]
+            if new_lhs is lhs and new_rhs is rhs:
+                done[key] = node
+            else:
+                done[key] = mk_binop(node.op, new_lhs, new_rhs)
+        elif t is SymArrayElem:
+            index = node.index
+            if not expanded:
+                todo.append((node, True))
+                todo.append((index, False))
+                continue
+            new_index = done[id(index)]
+            done[key] = node if new_index is index else mk_array_elem(node.array, new_index)
+        elif t is SymInt and node.name == name:
+            done[key] = value
+        else:
+            done[key] = node
+    return done[id(expr)]
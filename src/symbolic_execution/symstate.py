@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Optional
 
+from .cow import CowList, CowSlots
 from .symexpr import SymExpr
 from .path import PathConstraint
 
@@ -13,32 +14,41 @@ class SymbolicState:
     Represents the symbolic state of the JVM at some program point.
 
     - pc: program counter (bytecode index)
+    - depth: depth counter (the executor bounds path_constraint.depth())
+    - terminated: whether execution has finished on this path
     - stack: operand stack
     - locals: local variables (JVM slots)
     - path_constraint: accumulated path condition
-    - terminated: whether execution has finished on this path
     - error: optional error/violation description
     - return_value: (optional) value returned by this path, if any
+
+    Fields are declared in slot order, scalars and the per-step fields
+    first, so the hot slots sit together at the front of the object.
     """
     pc: int
-    stack: List[SymExpr] = field(default_factory=list)
-    locals: Dict[int, SymExpr] = field(default_factory=dict)
-    path_constraint: PathConstraint = field(default_factory=PathConstraint)
     depth: int = 0
     terminated: bool = False
+    stack: CowList = field(default_factory=CowList)
+    locals: CowSlots = field(default_factory=CowSlots)
+    path_constraint: PathConstraint = field(default_factory=PathConstraint)
     error: Optional[str] = None
     return_value: Optional[Any] = None
     
     def copy(self) -> "SymbolicState":
         """
-        Shallow copy of the state; symbolic expressions are immutable.
+        Shallow copy of the state; symbolic expressions and the path
+        constraint are immutable and shared with the copy, and the stack
+        and locals are copy-on-write, so forking is O(1).
         """
-        return SymbolicState(
-            pc=self.pc,
-            stack=list(self.stack),
-            locals=dict(self.locals),
-            path_constraint=self.path_constraint.copy(),
-            terminated=self.terminated,
-            error=self.error,
-            return_value=self.return_value, 
-        )
\ No newline at end of file
+        # Fields are set directly, bypassing the generated __init__ and its
+        # keyword handling; this runs on every fork.
+        new = object.__new__(SymbolicState)
+        new.pc = self.pc
+        new.depth = self.depth
+        new.terminated = self.terminated
+        new.stack = self.stack.copy()
+        new.locals = self.locals.copy()
+        new.path_constraint = self.path_constraint
+        new.error = self.error
+        new.return_value = self.return_value
+        return new
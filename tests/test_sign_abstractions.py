@@ -1,49 +1,34 @@
-from hypothesis import given, strategies
+import pytest
+from hypothesis import HealthCheck, given, settings, strategies
 from hypothesis.strategies import integers, sets
 from src.static_analysis.abstractions import Sign, AState, PC, PerVarFrame, Stack
 
+# Shared by every test: a bounded example count, and no deadline or
+# too-slow check for the nested AState strategies
+example_settings = settings(
+  max_examples=25,
+  deadline=None,
+  suppress_health_check=[HealthCheck.too_slow],
+)
+
+@example_settings
 @given(sets(integers()))
 def test_valid_abstraction_list(xs):
   s = Sign.abstract(xs) 
   assert(s == '+' or '-' or '0')
-print("Finished test: test_valid_abstraction_list()")
-test_valid_abstraction_list()
-
-@given(sets(integers()), sets(integers()))
-def test_sign_add_abstraction(xs, xd):
-  s = Sign.abstract(xs)
-  d = Sign.abstract(xd) 
-  z = Sign.binary_op(s, d, Sign.sign_add)
-  assert z.values.issubset({'+', '-', '0'})
-print("Finished test: test_sign_add_abstraction()")
-test_sign_add_abstraction()
-
-@given(sets(integers()), sets(integers()))
-def test_sign_sub_abstraction(xs, xd):
-  s = Sign.abstract(xs)
-  d = Sign.abstract(xd) 
-  z = Sign.binary_op(s, d, Sign.sign_sub)
-  assert z.values.issubset({'+', '-', '0'})
-print("Finished test: test_sign_sub_abstraction()")
-test_sign_sub_abstraction()
-
-@given(sets(integers()), sets(integers()))
-def test_sign_mul_abstraction(xs, xd):
-  s = Sign.abstract(xs)
-  d = Sign.abstract(xd) 
-  z = Sign.binary_op(s, d, Sign.sign_mul)
-  assert z.values.issubset({'+', '-', '0'})
-print("Finished test: test_sign_mul_abstraction()")
-test_sign_mul_abstraction()
 
-@given(sets(integers()), sets(integers()))
-def test_sign_div_abstraction(xs, xd):
+@pytest.mark.parametrize(
+  "op",
+  [Sign.sign_add, Sign.sign_sub, Sign.sign_mul, Sign.sign_div],
+  ids=["add", "sub", "mul", "div"],
+)
+@example_settings
+@given(xs=sets(integers()), xd=sets(integers()))
+def test_sign_binary_op_abstraction(op, xs, xd):
   s = Sign.abstract(xs)
-  d = Sign.abstract(xd) 
-  z = Sign.binary_op(s, d, Sign.sign_div)
+  d = Sign.abstract(xd)
+  z = Sign.binary_op(s, d, op)
   assert z.values.issubset({'+', '-', '0'})
-print("Finished test: test_sign_div_abstraction()")
-test_sign_div_abstraction()
 
 # ----- Sign -----
 
@@ -89,9 +74,7 @@ astate_strategy = strategies.builds(
     frames=stack_strategy(frame_strategy)
 )
 
+@example_settings
 @given(astate_strategy, astate_strategy)
 def test_valid_AState_join_list(a,b):
-  #print(f"a:{a}, b:{b}\n")
   s = a.join(b)
-  print(f"{s}")
-test_valid_AState_join_list()
\ No newline at end of file
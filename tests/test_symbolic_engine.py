@@ -0,0 +1,336 @@
+import pathlib
+import sys
+
+import pytest
+
+# The symbolic engine imports its siblings (interpreter) as top-level
+# packages, like my_analyzer.py sets up for the analyzers
+SRC = str(pathlib.Path(__file__).resolve().parents[1] / "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from jpamb import jvm
+from interpreter import Bytecode
+
+from symbolic_execution.config import SEConfig
+from symbolic_execution.constraints import negate
+from symbolic_execution.cow import CowList, CowSlots
+from symbolic_execution.executor import SymbolicExecutor
+from symbolic_execution.jvm_frontend import JVMFrontend
+from symbolic_execution.path import PathConstraint
+from symbolic_execution.solver_z3 import Solver
+from symbolic_execution.strategy import DFSStrategy
+from symbolic_execution.symexpr import (
+    SymArrayRef, SymInt, TRUE, FALSE, ZERO,
+    mk_int, mk_binop, mk_array_elem, nonneg, substitute,
+)
+
+x = SymInt("x")
+y = SymInt("y")
+
+I = jvm.Int()
+A = jvm.Array(I)
+
+
+def op(cls, **fields):
+    # jpamb opcodes may also record their bytecode offset, which the
+    # frontend never reads
+    if "offset" in getattr(cls, "__dataclass_fields__", {}):
+        fields.setdefault("offset", 0)
+    return cls(**fields)
+
+def push(v):
+    return op(jvm.Push, value=jvm.Value(I, v))
+
+def load(i):
+    return op(jvm.Load, type=I, index=i)
+
+def load_ref(i):
+    return op(jvm.Load, type=jvm.Reference(), index=i)
+
+RETURN = op(jvm.Return, type=I)
+ADD = op(jvm.Binary, type=I, operant=jvm.BinaryOpr.Add)
+ARRAY_LOAD = op(jvm.ArrayLoad, type=I)
+
+
+def method(name, *params):
+    return jvm.AbsMethodID(
+        jvm.ClassName("jpamb/cases/Test"),
+        jvm.MethodID(name, jvm.ParameterType(params or (I, I)), I),
+    )
+
+def frontend(code, *params):
+    m = method("m", *params)
+    return JVMFrontend(bytecode=Bytecode(None, {m: code}), entry_method=m)
+
+def run(fe):
+    config = SEConfig()
+    executor = SymbolicExecutor(
+        frontend=fe, config=config, solver=Solver(), strategy=DFSStrategy()
+    )
+    return sorted(f.kind for f in executor.run(fe.initial_state(config)))
+
+
+# ----- CowList -----
+
+def test_cow_list_fork_then_mutate_both_sides():
+    a = CowList([1, 2, 3])
+    b = a.copy()
+    a.append(4)
+    b.append(5)
+    assert a == [1, 2, 3, 4]
+    assert b == [1, 2, 3, 5]
+
+def test_cow_list_pop_on_shared_list():
+    a = CowList([1, 2, 3])
+    b = a.copy()
+    assert b.pop() == 3
+    assert b.pop() == 2
+    # popping only lowered b's logical length
+    assert a == [1, 2, 3]
+    assert len(b) == 1 and list(b) == [1]
+    b.append(9)
+    assert b == [1, 9]
+    assert a == [1, 2, 3]
+    assert a.pop() == 3 and a == [1, 2]
+
+def test_cow_list_setitem_and_delitem_on_shared_list():
+    a = CowList([1, 2, 3, 4])
+    b = a.copy()
+    b[-1] = 40
+    del a[-2:]
+    assert a == [1, 2]
+    assert b == [1, 2, 3, 40]
+    c = b.copy()
+    del c[0]
+    assert c == [2, 3, 40]
+    assert b == [1, 2, 3, 40]
+
+def test_cow_list_reads_respect_logical_length():
+    a = CowList([1, 2, 3])
+    b = a.copy()
+    b.pop()
+    assert b[-1] == 2
+    assert b[0:5] == [1, 2]
+    try:
+        b[2]
+        assert False, "expected IndexError"
+    except IndexError:
+        pass
+
+
+# ----- CowSlots -----
+
+def test_cow_slots_fork_then_mutate_both_sides():
+    a = CowSlots({0: "p", 2: "q"})
+    b = a.copy()
+    a[2] = "a"
+    b[0] = "b"
+    b[5] = "c"
+    assert dict(a.items()) == {0: "p", 2: "a"}
+    assert dict(b.items()) == {0: "b", 2: "q", 5: "c"}
+    assert 1 not in b and 5 in b and 5 not in a
+    assert b.get(4) is None and len(b) == 3
+
+
+# ----- PathConstraint -----
+
+def test_path_constraint_key_and_contains_with_repeats():
+    c1 = mk_binop("<", x, ZERO)
+    c2 = mk_binop(">", y, mk_int(3))
+    p = PathConstraint().add(c1).add(c2).add(c1)
+    assert p.depth() == 3
+    assert p.key() == frozenset({c1, c2})
+    assert c1 in p and c2 in p
+    assert mk_binop("<", x, ZERO) in p
+    assert negate(c1) not in p
+    # repeating the last constraint returns the same node
+    assert p.add(c1) is p
+    # forks share their prefix and don't see each other's additions
+    q = p.parent.add(negate(c2))
+    assert negate(c2) in q and negate(c2) not in p
+    assert c2 not in p.parent.parent
+
+
+# ----- hash-consing -----
+
+def test_hash_consing_and_folding():
+    assert mk_binop("+", x, y) is mk_binop("+", x, y)
+    assert mk_array_elem("a", x) is mk_array_elem("a", x)
+    assert mk_binop("+", mk_int(2), mk_int(3)) is mk_int(5)
+    assert mk_binop("<", mk_int(1), mk_int(2)) is TRUE
+    assert mk_binop("-", x, x) is ZERO
+    c = mk_binop("<", x, y)
+    assert negate(negate(c)) is c
+    assert negate(TRUE) is FALSE
+
+
+# ----- Solver caches -----
+
+def test_solver_cache_hit_after_unsat_subset():
+    solver = Solver()
+    lt = mk_binop("<", x, ZERO)
+    gt = mk_binop(">", x, ZERO)
+    unsat = PathConstraint().add(lt).add(gt)
+    assert not solver.is_sat(unsat)
+    calls = len(solver._solved)
+
+    # a superset of the unsat set is answered from the cache
+    longer = unsat.add(mk_binop("==", y, mk_int(1)))
+    assert not solver.is_sat(longer)
+    assert len(solver._solved) == calls
+
+    # a subset of a sat set reuses its model
+    sat = PathConstraint().add(lt).add(mk_binop("==", y, mk_int(1)))
+    model = solver.get_model(sat)
+    assert model["x"] < 0 and model["y"] == 1
+    assert solver.get_model(PathConstraint().add(lt)) == model
+    assert len(solver._solved) == calls + 1
+
+def test_solver_incremental_queries_match_fresh_solver():
+    a = mk_binop(">", x, mk_int(5))
+    b = mk_binop("<", x, mk_int(3))
+    c = mk_binop("==", y, x)
+    root = PathConstraint().add(a)
+    paths = [root.add(b), root.add(c), root.add(c).add(negate(a)), root]
+    solver = Solver()
+    for p in paths:
+        assert solver.is_sat(p) == Solver().is_sat(p)
+
+
+# ----- JVM frontend -----
+
+def test_null_check_on_array_parameter():
+    # if (a != null) return 1; return 0;
+    code = [
+        load_ref(0), op(jvm.Ifz, condition="isnot", target=4),
+        push(0), RETURN,
+        push(1), RETURN,
+    ]
+    fe = frontend(code, A)
+    (s,) = fe.step(fe.initial_state(SEConfig()))
+    assert s.pc.offset == 4
+    assert run(frontend(code, A)) == ["ok"]
+
+def test_parameters_are_bound_to_symbols():
+    fe = frontend([push(0), RETURN], A, I)
+    s = fe.initial_state(SEConfig())
+    assert s.locals[0] == SymArrayRef(name="arg0")
+    assert s.locals[1] == SymInt(name="arg1")
+    length = fe.array_table["arg0"]["length"]
+    assert length == SymInt(name="arg0_len")
+    assert list(s.path_constraint) == [nonneg(length)]
+
+def test_straight_line_opcodes_run_in_one_step():
+    fe = frontend([push(1), push(2), ADD, RETURN])
+    (s,) = fe.step(fe.initial_state(SEConfig()))
+    assert s.terminated and s.error == "ok"
+    assert s.return_value is mk_int(3)
+
+def test_straight_line_run_stops_at_jump_target():
+    # the Goto makes offset 2 a jump target
+    fe = frontend([push(1), push(2), ADD, RETURN, op(jvm.Goto, target=2)])
+    (s,) = fe.step(fe.initial_state(SEConfig()))
+    assert s.pc.offset == 2 and not s.terminated
+    assert s.stack == [mk_int(1), mk_int(2)]
+
+@pytest.mark.skipif(not hasattr(jvm, "Incr"), reason="no Incr opcode")
+def test_incr_updates_local_in_place():
+    code = [
+        op(jvm.Incr, index=0, amount=2), op(jvm.Incr, index=0, amount=3),
+        load(0), RETURN,
+    ]
+    fe = frontend(code)
+    (s,) = fe.step(fe.initial_state(SEConfig()))
+    # expressions are hash-consed by operand identity, so build the
+    # expected one from the state's own input symbol
+    arg0 = fe.initial_state(SEConfig()).locals[0]
+    plus_two = mk_binop("+", arg0, mk_int(2))
+    assert s.return_value == mk_binop("+", plus_two, mk_int(3))
+    assert s.locals[1] == SymInt(name="arg1")
+
+@pytest.mark.parametrize("cls, kind", [
+    ("java/lang/AssertionError", "assertion error"),
+    ("java/lang/ArithmeticException", "divide by zero"),
+    ("java/lang/Object", "unsupported new: java/lang/Object"),
+])
+def test_new_exception_ends_path_with_label(cls, kind):
+    fe = frontend([op(jvm.New, classname=jvm.ClassName(cls)), op(jvm.Throw)])
+    assert run(fe) == [kind]
+
+def test_symbolic_index_reports_both_bounds():
+    code = [load_ref(0), load(1), ARRAY_LOAD, RETURN]
+    fe = frontend(code, A, I)
+    ok, low, high = fe.step(fe.initial_state(SEConfig()))
+    arg1 = SymInt(name="arg1")
+    length = fe.array_table["arg0"]["length"]
+    assert ok.pc.offset == 3 and ok.stack == [mk_array_elem("arg0", arg1)]
+    assert mk_binop(">=", arg1, ZERO) in ok.path_constraint
+    assert mk_binop("<", arg1, length) in ok.path_constraint
+    assert low.error == high.error == "out of bounds"
+    assert negate(mk_binop(">=", arg1, ZERO)) in low.path_constraint
+    assert negate(mk_binop("<", arg1, length)) in high.path_constraint
+    assert run(frontend(code, A, I)) == ["ok", "out of bounds", "out of bounds"]
+
+def test_repeated_index_is_checked_once():
+    access = [load_ref(0), load(1), ARRAY_LOAD]
+    code = access + access + [ADD, RETURN]
+    assert run(frontend(code, A, I)) == ["ok", "out of bounds", "out of bounds"]
+
+@pytest.mark.parametrize("index, kinds", [
+    (1, ["ok"]),
+    (3, ["out of bounds"]),
+    (-1, ["out of bounds"]),
+])
+def test_constant_index_into_new_array(index, kinds):
+    code = [
+        push(3), op(jvm.NewArray, type=I, dim=1), push(index), ARRAY_LOAD,
+        RETURN,
+    ]
+    fe = frontend(code)
+    # a constant index is decided without forking
+    assert len(fe.step(fe.initial_state(SEConfig()))) == 1
+    assert run(frontend(code)) == kinds
+
+def test_substitute_rewrites_only_mentioning_subtrees():
+    two = mk_int(2)
+    e = mk_binop("+", mk_binop("*", x, y), y)
+    assert substitute(e, "x", two) is mk_binop("+", mk_binop("*", two, y), y)
+    assert substitute(e, "z", two) is e
+    assert substitute(mk_binop("-", x, mk_int(1)), "x", two) is mk_int(1)
+
+def test_equality_branch_concretizes_stack_and_locals():
+    # if (a == 0) ... with a still on the stack and in local 0
+    code = [
+        load(0), load(0), op(jvm.Ifz, condition="ne", target=5), RETURN,
+        push(1), RETURN,
+    ]
+    fe = frontend(code)
+    taken, zero = fe.step(fe.initial_state(SEConfig()))
+    arg0 = SymInt(name="arg0")
+    assert taken.pc.offset == 5
+    assert taken.stack == [arg0] and taken.locals[0] == arg0
+    assert zero.pc.offset == 3
+    assert zero.stack == [ZERO] and zero.locals[0] is ZERO
+    assert zero.locals[1] == SymInt(name="arg1")
+
+def test_memo_skips_a_state_already_expanded_at_a_jump_target():
+    fe = frontend([op(jvm.Goto, target=0)])
+    (s,) = fe.step(fe.initial_state(SEConfig()))
+    assert s.pc.offset == 0
+    assert fe.step(s) == []
+    # a new run starts with an empty memo
+    assert run(fe) == []
+    assert fe._visited
+    fe.initial_state(SEConfig())
+    assert not fe._visited
+
+def test_loop_with_symbolic_guard_terminates_through_memo():
+    # while (a > 0) {} return 1;
+    code = [
+        load(0), op(jvm.Ifz, condition="le", target=3),
+        op(jvm.Goto, target=0), push(1), RETURN,
+    ]
+    fe = frontend(code)
+    assert run(fe) == ["ok"]
+    assert run(fe) == ["ok"]